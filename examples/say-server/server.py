@@ -3,8 +3,11 @@
 # requires-python = ">=3.10"
 # dependencies = [
 #     "mcp>=1.26.0",
+#     "numpy>=1.26.0",
 #     "uvicorn>=0.34.0",
 #     "starlette>=0.46.0",
+#     "orjson>=3.10",
+#     "pybase64>=1.4.0",
 #     "pocket-tts>=1.0.1",
 # ]
 # ///
@@ -32,18 +35,25 @@ Usage:
   python server.py --stdio
 """
 from __future__ import annotations
+import array
 import asyncio
-import base64
+import concurrent.futures
+import hashlib
+import json
 import logging
 import os
+import secrets
 import sys
 import time
-import uuid
+from collections import OrderedDict
 from dataclasses import dataclass, field
 from pathlib import Path
 from typing import Annotated, Literal
 from pydantic import Field
 
+import numpy as np
+import orjson
+import pybase64
 import torch
 import uvicorn
 from mcp.server.fastmcp import FastMCP
@@ -76,16 +86,6 @@ tts_model: TTSModel | None = None
 # TTS Queue State Management
 # ------------------------------------------------------
 
-@dataclass
-class AudioChunkData:
-    """Audio chunk with timing metadata."""
-    index: int
-    audio_base64: str
-    char_start: int
-    char_end: int
-    duration_ms: float
-
-
 @dataclass
 class TTSQueueState:
     """State for a TTS generation queue."""
@@ -95,27 +95,75 @@ class TTSQueueState:
     status: Literal["active", "complete", "error"] = "active"
     error_message: str | None = None
 
-    # Text queue
-    text_queue: asyncio.Queue = field(default_factory=asyncio.Queue)
+    # Text queue, bounded so a stalled consumer can't pin unlimited text;
+    # add_tts_text coalesces into the tail item when it fills up
+    text_queue: asyncio.Queue = field(default_factory=lambda: asyncio.Queue(maxsize=256))
     end_signaled: bool = False
 
-    # Audio output
-    audio_chunks: list[AudioChunkData] = field(default_factory=list)
+    # Audio output, struct-of-arrays: one column per chunk field instead of
+    # a list of dataclass instances. The poll response is then built by
+    # zipping slices (C-level iteration, no attribute lookups) and the
+    # numeric columns live unboxed in array.array. Appends are atomic under
+    # the GIL; the producer fills chunk_audio_b64 last so its length is the
+    # count of fully written rows.
+    chunk_indices: array.array = field(default_factory=lambda: array.array("i"))
+    chunk_char_starts: array.array = field(default_factory=lambda: array.array("i"))
+    chunk_char_ends: array.array = field(default_factory=lambda: array.array("i"))
+    chunk_durations_ms: array.array = field(default_factory=lambda: array.array("d"))
+    chunk_audio_b64: list[str] = field(default_factory=list)
     chunks_delivered: int = 0
 
+    # Long-poll wakeup: the producer notifies after each chunk or status
+    # change so poll_tts_audio can wait briefly instead of returning empty
+    cond: asyncio.Condition = field(default_factory=asyncio.Condition)
+
     # Tracking
     created_at: float = field(default_factory=time.time)
     last_activity: float = field(default_factory=time.time)  # Last text or end signal
-    lock: asyncio.Lock = field(default_factory=asyncio.Lock)
     task: asyncio.Task | None = None
 
 
 # Active TTS queues
 tts_queues: dict[str, TTSQueueState] = {}
 
+# Canned poll_tts_audio control replies: most polls carry no chunks, so
+# serve them without serializing anything
+_EMPTY_ACTIVE = '{"done": false, "status": "active", "n": 0}'
+_EMPTY_DONE_TEMPLATE = '{"done": true, "status": "%s", "n": 0}'
+
+
+def _dumps(obj) -> str:
+    """Serialize a machine-read response body (orjson, no indent)."""
+    return orjson.dumps(obj).decode()
+
 # Queue timeout: if no activity for this long, mark as error
 QUEUE_TIMEOUT_SECONDS = 30
 
+# One background reaper sweeps finished queues instead of each poll
+# spawning its own delayed-cleanup task (and pinning audio in memory
+# until 60s after the *last* poll)
+REAP_INTERVAL_SECONDS = 10
+REAP_AFTER_SECONDS = 60
+_reaper_task: asyncio.Task | None = None
+
+
+async def _reap_loop():
+    """Periodically drop finished queues that have gone quiet."""
+    while True:
+        await asyncio.sleep(REAP_INTERVAL_SECONDS)
+        now = time.time()
+        for queue_id, state in list(tts_queues.items()):
+            if state.status in ("complete", "error") and now - state.last_activity > REAP_AFTER_SECONDS:
+                tts_queues.pop(queue_id, None)
+                logger.debug(f"Reaped TTS queue {queue_id}")
+
+
+def _ensure_reaper():
+    """Start the reaper lazily, once a running loop exists."""
+    global _reaper_task
+    if _reaper_task is None or _reaper_task.done():
+        _reaper_task = asyncio.get_event_loop().create_task(_reap_loop())
+
 
 # ------------------------------------------------------
 # Public Tool: say
@@ -138,6 +186,25 @@ PREDEFINED_VOICES = {
 
 DEFAULT_VOICE = "cosette"
 
+# The voice list is static; serialize it once at import. indent=2 stays
+# because this reply is read by the model/user, not the view.
+_LIST_VOICES_REPLY = json.dumps({
+    "predefined_voices": list(PREDEFINED_VOICES.keys()),
+    "default_voice": DEFAULT_VOICE,
+    "custom_voice_formats": [
+        "hf://kyutai/tts-voices/<collection>/<file>.wav",
+        "/path/to/local/voice.wav",
+    ],
+    "collections": [
+        "alba-mackenna (CC-BY 4.0) - voice-acted characters",
+        "vctk (CC-BY 4.0) - VCTK dataset speakers",
+        "cml-tts/fr (CC-BY 4.0) - French voices",
+        "voice-donations (CC0) - public domain community voices",
+        "expresso (CC-BY-NC 4.0) - expressive (NON-COMMERCIAL ONLY)",
+        "ears (CC-BY-NC 4.0) - emotional (NON-COMMERCIAL ONLY)",
+    ],
+}, indent=2)
+
 
 @mcp.tool()
 def list_voices() -> list[types.TextContent]:
@@ -146,24 +213,7 @@ def list_voices() -> list[types.TextContent]:
     Returns the predefined voice names that can be used with the say tool.
     You can also use HuggingFace URLs (hf://kyutai/tts-voices/...) or local file paths.
     """
-    import json
-    voice_info = {
-        "predefined_voices": list(PREDEFINED_VOICES.keys()),
-        "default_voice": DEFAULT_VOICE,
-        "custom_voice_formats": [
-            "hf://kyutai/tts-voices/<collection>/<file>.wav",
-            "/path/to/local/voice.wav",
-        ],
-        "collections": [
-            "alba-mackenna (CC-BY 4.0) - voice-acted characters",
-            "vctk (CC-BY 4.0) - VCTK dataset speakers",
-            "cml-tts/fr (CC-BY 4.0) - French voices",
-            "voice-donations (CC0) - public domain community voices",
-            "expresso (CC-BY-NC 4.0) - expressive (NON-COMMERCIAL ONLY)",
-            "ears (CC-BY-NC 4.0) - emotional (NON-COMMERCIAL ONLY)",
-        ],
-    }
-    return [types.TextContent(type="text", text=json.dumps(voice_info, indent=2))]
+    return [types.TextContent(type="text", text=_LIST_VOICES_REPLY)]
 
 
 @mcp.tool(meta={
@@ -193,7 +243,7 @@ def say(
     Note: English only. Non-English text may produce poor or garbled results.
     """
     # Generate a unique ID for this view instance (used for speak lock coordination)
-    view_uuid = uuid.uuid4().hex[:12]
+    view_uuid = secrets.token_hex(6)
 
     # This is a no-op - the view handles everything via ontoolinputpartial
     # The tool exists to:
@@ -213,16 +263,18 @@ def say(
 # ------------------------------------------------------
 
 @mcp.tool(meta={"ui":{"visibility":["app"]}})
-async def create_tts_queue(voice: str = "cosette") -> list[types.TextContent]:
+async def create_tts_queue(voice: str = "cosette", initial_text: str = "") -> list[types.TextContent]:
     """Create a TTS generation queue. Returns queue_id and sample_rate.
 
     Args:
         voice: Voice to use (cosette, alba, brenda, etc.)
+        initial_text: Optional first text to queue immediately, saving the
+            view one add_tts_text round trip when text is already known
     """
     if tts_model is None:
         return [types.TextContent(type="text", text='{"error": "TTS model not loaded"}')]
 
-    queue_id = uuid.uuid4().hex[:12]
+    queue_id = secrets.token_hex(6)
     sample_rate = tts_model.config.mimi.sample_rate
 
     state = TTSQueueState(
@@ -232,15 +284,21 @@ async def create_tts_queue(voice: str = "cosette") -> list[types.TextContent]:
     )
     tts_queues[queue_id] = state
 
+    # Queue any initial text before the task starts so the first chunk can
+    # enter the chunker as soon as the voice state is ready
+    if initial_text:
+        state.text_queue.put_nowait(initial_text)
+        state.last_activity = time.time()
+
     # Start background TTS processing task
     state.task = asyncio.create_task(_run_tts_queue(state))
+    _ensure_reaper()
 
     logger.info(f"Created TTS queue {queue_id}")
 
-    import json
     return [types.TextContent(
         type="text",
-        text=json.dumps({"queue_id": queue_id, "sample_rate": sample_rate})
+        text=_dumps({"queue_id": queue_id, "sample_rate": sample_rate})
     )]
 
 
@@ -263,6 +321,14 @@ def add_tts_text(queue_id: str, text: str) -> list[types.TextContent]:
         state.text_queue.put_nowait(text)
         state.last_activity = time.time()  # Update activity timestamp
     except asyncio.QueueFull:
+        # Backpressure: merge into the tail item instead of dropping. The
+        # chunker concatenates queued text anyway, so coalescing is
+        # lossless and compresses bursts from slow consumers.
+        tail_queue = state.text_queue._queue  # underlying deque
+        if tail_queue and tail_queue[-1] is not None:
+            tail_queue[-1] = tail_queue[-1] + text
+            state.last_activity = time.time()
+            return [types.TextContent(type="text", text='{"queued": true, "coalesced": true}')]
         return [types.TextContent(type="text", text='{"error": "Queue full"}')]
 
     return [types.TextContent(type="text", text='{"queued": true}')]
@@ -323,7 +389,7 @@ def cancel_tts_queue(queue_id: str) -> list[types.TextContent]:
 
 
 @mcp.tool(meta={"ui":{"visibility":["app"]}})
-def poll_tts_audio(queue_id: str) -> list[types.TextContent]:
+async def poll_tts_audio(queue_id: str) -> list[types.TextContent]:
     """Poll for available audio chunks from a TTS queue.
 
     Returns base64-encoded audio chunks with timing metadata.
@@ -332,9 +398,6 @@ def poll_tts_audio(queue_id: str) -> list[types.TextContent]:
     Args:
         queue_id: The queue ID from create_tts_queue
     """
-    import json
-    import time
-
     state = tts_queues.get(queue_id)
     if not state:
         return [types.TextContent(type="text", text='{"error": "Queue not found"}')]
@@ -342,46 +405,63 @@ def poll_tts_audio(queue_id: str) -> list[types.TextContent]:
     # Update last activity to prevent timeout during active polling
     state.last_activity = time.time()
 
-    # Get new chunks (use sync approach since we can't await in tool)
-    # The lock is async, so we need to be careful here
-    # For simplicity, just grab what's available without locking
-    new_chunks = state.audio_chunks[state.chunks_delivered:]
-    state.chunks_delivered = len(state.audio_chunks)
+    # chunk_audio_b64 is written last per row, so its length bounds the
+    # fully written rows we may deliver
+    delivered = state.chunks_delivered
+    available = len(state.chunk_audio_b64)
 
-    # Consider queues with errors as "done" so view stops polling
-    done = (state.status == "complete" or state.status == "error") and state.chunks_delivered >= len(state.audio_chunks)
-
-    response = {
-        "chunks": [
-            {
-                "index": c.index,
-                "audio_base64": c.audio_base64,
-                "char_start": c.char_start,
-                "char_end": c.char_end,
-                "duration_ms": c.duration_ms,
-            }
-            for c in new_chunks
-        ],
-        "done": done,
-        "status": state.status,
-    }
+    # Long-poll: with nothing new and the queue still active, hold the
+    # request briefly so a chunk produced in the meantime rides back on
+    # this response instead of costing the view another round trip
+    if available == delivered and state.status == "active":
+        async with state.cond:
+            try:
+                await asyncio.wait_for(state.cond.wait(), timeout=0.5)
+            except asyncio.TimeoutError:
+                pass
+        available = len(state.chunk_audio_b64)
 
-    # Include error message if present
+    # Consider queues with errors as "done" so view stops polling
+    done = (state.status == "complete" or state.status == "error") and available == delivered
+
+    # Most polls arrive between chunks and return nothing; skip json.dumps
+    # for those and reuse the precomputed replies
+    if available == delivered and not state.error_message:
+        text = (_EMPTY_DONE_TEMPLATE % state.status) if done else _EMPTY_ACTIVE
+        return [types.TextContent(type="text", text=text)]
+
+    chunks = [
+        {
+            "index": i,
+            "audio_base64": b64,
+            "char_start": cs,
+            "char_end": ce,
+            "duration_ms": d,
+        }
+        for i, b64, cs, ce, d in zip(
+            state.chunk_indices[delivered:available],
+            state.chunk_audio_b64[delivered:available],
+            state.chunk_char_starts[delivered:available],
+            state.chunk_char_ends[delivered:available],
+            state.chunk_durations_ms[delivered:available],
+        )
+    ]
+    state.chunks_delivered = available
+
+    # Split response: content[0] is a tiny control message the view parses
+    # on every poll; the (potentially large) chunk payload rides in
+    # content[1] and is only present — and only parsed — when n > 0
+    control = {"done": done, "status": state.status, "n": len(chunks)}
     if state.error_message:
-        response["error"] = state.error_message
-
-    # Clean up completed or errored queues
-    if done:
-        # Schedule cleanup after a delay
-        async def cleanup():
-            await asyncio.sleep(60)
-            tts_queues.pop(queue_id, None)
-        try:
-            asyncio.get_event_loop().create_task(cleanup())
-        except RuntimeError:
-            pass
+        control["error"] = state.error_message
+
+    # Finished queues are swept by the background reaper once they have
+    # been quiet for REAP_AFTER_SECONDS; nothing to schedule here
 
-    return [types.TextContent(type="text", text=json.dumps(response))]
+    content = [types.TextContent(type="text", text=_dumps(control))]
+    if chunks:
+        content.append(types.TextContent(type="text", text=_dumps(chunks)))
+    return content
 
 
 # ------------------------------------------------------
@@ -412,10 +492,25 @@ class StreamingTextChunker:
         self.min_tokens = min_tokens
         self.buffer = ""
 
+        # Incremental tokenization state: token ids covering
+        # buffer[:_tokenized_upto]. Re-tokenizing the whole buffer on
+        # every appended LLM token is O(N^2); tokenizing only the new
+        # suffix keeps the stream O(N). _tokenized_upto always sits at a
+        # whitespace boundary so each suffix starts at a word start --
+        # SentencePiece's dummy-prefix marker then lands where a word
+        # actually begins instead of injecting a space mid-word.
+        self._tokens: list[int] = []
+        self._tokenized_upto = 0
+
         # Cache end-of-sentence token IDs for boundary detection
         _, *eos_tokens = tokenizer(".!...?").tokens[0].tolist()
         self.eos_tokens = set(eos_tokens)
 
+        # Detect whether the tokenizer prepends a special leading token so
+        # suffix tokenization can drop the duplicate when extending
+        probe = tokenizer("a").tokens[0].tolist()
+        self._leading_token = probe[0] if len(probe) > 1 else None
+
     def add_text(self, text: str) -> list[str]:
         """Add text to buffer, return any complete chunks ready for processing.
 
@@ -426,8 +521,53 @@ class StreamingTextChunker:
             List of text chunks ready for TTS (may be empty if still buffering)
         """
         self.buffer += text
+        # Cheap gate before touching SentencePiece: tokens average ~3
+        # chars, so a buffer this short cannot be worth emitting yet.
+        # flush() tokenizes whatever is still pending.
+        if len(self.buffer) < 3 * self.min_tokens:
+            return []
+        self._tokenize_pending()
         return self._extract_ready_chunks()
 
+    def _tokenize_pending(self, final: bool = False):
+        """Tokenize only the not-yet-tokenized tail of the buffer.
+
+        The trailing partial word (and the whitespace before it) stays
+        pending: encoding mid-word text standalone gets the word-start
+        dummy prefix, which would decode as a spurious space inside the
+        word. The partial word is re-tokenized together with whatever
+        extends it on the next call. final=True (end of stream) takes
+        the tail as-is since nothing can extend it anymore.
+        """
+        pending = self.buffer[self._tokenized_upto:]
+        if not pending:
+            return
+        if not final:
+            cut = len(pending)
+            while cut > 0 and not pending[cut - 1].isspace():
+                cut -= 1
+            while cut > 0 and pending[cut - 1].isspace():
+                cut -= 1
+            if cut == 0:
+                return
+            pending = pending[:cut]
+        new_tokens = self.tokenizer(pending).tokens[0].tolist()
+        if self._tokens and self._leading_token is not None and new_tokens and new_tokens[0] == self._leading_token:
+            new_tokens = new_tokens[1:]
+        self._tokens.extend(new_tokens)
+        self._tokenized_upto += len(pending)
+
+    def _reset_buffer(self):
+        self.buffer = ""
+        self._tokens = []
+        self._tokenized_upto = 0
+
+    def _consume_tokenized(self):
+        """Drop the tokenized prefix, keeping the pending tail buffered."""
+        self.buffer = self.buffer[self._tokenized_upto:]
+        self._tokens = []
+        self._tokenized_upto = 0
+
     def flush(self) -> list[str]:
         """Flush remaining buffer as final chunk(s).
 
@@ -436,14 +576,15 @@ class StreamingTextChunker:
         Returns:
             List of final text chunks (may be empty if buffer was empty)
         """
-        if not self.buffer.strip():
-            return []
-
-        # Force emit whatever remains
+        # Catch up on the pending tail, trailing partial word included
+        self._tokenize_pending(final=True)
+        # Force emit whatever remains; a single strip pass covers both the
+        # emptiness check and the residual chunk text
         chunks = self._extract_ready_chunks(force_emit=True)
-        if self.buffer.strip():
-            chunks.append(self.buffer.strip())
-            self.buffer = ""
+        remainder = self.buffer.strip()
+        if remainder:
+            chunks.append(remainder)
+            self._reset_buffer()
         return chunks
 
     def _extract_ready_chunks(self, force_emit: bool = False) -> list[str]:
@@ -460,11 +601,13 @@ class StreamingTextChunker:
 
     def _try_extract_chunk(self, force_emit: bool = False) -> str | None:
         """Try to extract one chunk from buffer."""
-        text = self.buffer.strip()
+        # Only the tokenized prefix is up for emission; the pending
+        # partial word has no token ids yet and must not be split off
+        text = self.buffer[:self._tokenized_upto].strip()
         if not text:
             return None
 
-        tokens = self.tokenizer(text).tokens[0].tolist()
+        tokens = self._tokens
         num_tokens = len(tokens)
 
         # Not enough tokens yet
@@ -476,9 +619,8 @@ class StreamingTextChunker:
             # Only emit early if we have a complete sentence at a good length
             if num_tokens >= self.min_tokens and self._ends_with_sentence_boundary(tokens):
                 # Found a complete sentence - emit it
-                chunk = text
-                self.buffer = ""
-                return chunk
+                self._consume_tokenized()
+                return text
             return None
 
         # Over max_tokens or force_emit - find best split point
@@ -486,16 +628,19 @@ class StreamingTextChunker:
 
         if split_idx == 0:
             if force_emit:
-                chunk = text
-                self.buffer = ""
-                return chunk
+                self._consume_tokenized()
+                return text
             return None
 
-        # Decode tokens up to split point
+        # Decode tokens up to split point; the remainder keeps its token
+        # ids so nothing is re-tokenized. The untokenized tail rides
+        # along unchanged behind the decoded remainder.
         chunk_text = self.tokenizer.sp.decode(tokens[:split_idx])
-        remaining_text = self.tokenizer.sp.decode(tokens[split_idx:])
-
-        self.buffer = remaining_text
+        tail = self.buffer[self._tokenized_upto:]
+        self._tokens = tokens[split_idx:]
+        remainder = self.tokenizer.sp.decode(self._tokens)
+        self.buffer = remainder + tail
+        self._tokenized_upto = len(remainder)
         return chunk_text.strip()
 
     def _find_best_split(self, tokens: list[int], force_emit: bool = False) -> int:
@@ -552,7 +697,91 @@ class StreamingTextChunker:
         """Approximate token count in buffer."""
         if not self.buffer.strip():
             return 0
-        return len(self.tokenizer(self.buffer).tokens[0].tolist())
+        self._tokenize_pending()
+        return len(self._tokens)
+
+
+# Dedicated single-thread executor for model work. Generation for the one
+# shared model must serialize anyway; a private thread keeps it from
+# queueing behind unrelated jobs on the loop's default pool and keeps
+# inter-chunk latency consistent.
+_TTS_EXECUTOR = concurrent.futures.ThreadPoolExecutor(max_workers=1, thread_name_prefix="tts-gen")
+
+
+# Voice conditioning states, shared across queues. Building one (audio
+# prompt load + encode + conditioning) costs hundreds of ms and dwarfs
+# short-chunk synthesis, so each voice is prepared exactly once.
+_voice_state_cache: dict[str, dict] = {}
+_voice_state_lock = asyncio.Lock()
+
+
+async def _get_or_build_voice_state(voice: str) -> dict:
+    """Get the cached model state for a voice, building it on first use."""
+    model_state = _voice_state_cache.get(voice)
+    if model_state is not None:
+        return model_state
+    async with _voice_state_lock:
+        model_state = _voice_state_cache.get(voice)
+        if model_state is None:
+            loop = asyncio.get_event_loop()
+            model_state = await loop.run_in_executor(
+                _TTS_EXECUTOR,
+                lambda: tts_model._cached_get_state_for_audio_prompt(voice, truncate=True),
+            )
+            _voice_state_cache[voice] = model_state
+    return model_state
+
+
+# Synthesized-audio LRU keyed by (voice, chunk text). Chunk texts are
+# sentence-sized (StreamingTextChunker), so repeated phrases and replayed
+# utterances hit at phrase granularity: a hit returns in ~1ms vs a full
+# model inference.
+_AUDIO_CACHE_MAX_ENTRIES = 256
+_audio_cache: OrderedDict[bytes, tuple[str, float]] = OrderedDict()
+
+
+def _linear_to_ulaw(pcm: np.ndarray) -> np.ndarray:
+    """Vectorized G.711 mu-law encode of int16 PCM.
+
+    8 bits/sample is perceptually transparent for speech and halves both
+    the wire bytes and the client-side decode work. Hand-rolled with NumPy
+    because audioop was removed from the stdlib in Python 3.13.
+    """
+    samples = pcm.astype(np.int32)
+    sign = np.where(samples < 0, 0x80, 0)
+    magnitude = np.minimum(np.abs(samples), 32635) + 0x84
+    # Segment = highest set bit - 7; frexp's exponent is the bit length
+    exponent = np.frexp(magnitude.astype(np.float32))[1] - 8
+    mantissa = (magnitude >> (exponent + 3)) & 0x0F
+    return (~(sign | (exponent << 4) | mantissa) & 0xFF).astype(np.uint8)
+
+
+def _audio_cache_key(voice: str, text: str) -> bytes:
+    return hashlib.blake2b((voice + "\0" + text).encode(), digest_size=16).digest()
+
+
+async def _wake_pollers(state: TTSQueueState):
+    """Wake any long-polling poll_tts_audio calls waiting on this queue."""
+    async with state.cond:
+        state.cond.notify_all()
+
+
+def _clone_model_state(model_state: dict) -> dict:
+    """Clone a cached voice state for exclusive use by one queue.
+
+    Copies dicts one level deep and clones tensors so the queue can mutate
+    its state freely while the shared voice cache stays pristine.
+    """
+    def clone_value(value):
+        if isinstance(value, torch.Tensor):
+            return value.clone()
+        if isinstance(value, dict):
+            return {k: clone_value(v) for k, v in value.items()}
+        if isinstance(value, list):
+            return [clone_value(v) for v in value]
+        return value
+
+    return {key: clone_value(value) for key, value in model_state.items()}
 
 
 async def _run_tts_queue(state: TTSQueueState):
@@ -562,7 +791,10 @@ async def _run_tts_queue(state: TTSQueueState):
         state.error_message = "TTS model not loaded"
         return
 
-    model_state = tts_model._cached_get_state_for_audio_prompt(state.voice, truncate=True)
+    # Clone the shared voice state once per queue: chunks of the same
+    # utterance then share it in place (copy_state=False below) instead of
+    # paying a full state copy inside generation for every chunk
+    model_state = _clone_model_state(await _get_or_build_voice_state(state.voice))
     chunker = StreamingTextChunker(tts_model.flow_lm.conditioner.tokenizer)
     chunk_index = 0
     char_offset = 0
@@ -576,16 +808,52 @@ async def _run_tts_queue(state: TTSQueueState):
                     timeout=5.0  # Check every 5 seconds
                 )
             except asyncio.TimeoutError:
+                # A full queue may have swallowed the EOF sentinel; the
+                # flag is authoritative, so an ended-and-drained queue is
+                # EOF, not inactivity
+                if state.end_signaled and state.text_queue.empty():
+                    text_item = None
                 # Check if queue is stale (no activity for too long)
-                if time.time() - state.last_activity > QUEUE_TIMEOUT_SECONDS:
+                elif time.time() - state.last_activity > QUEUE_TIMEOUT_SECONDS:
                     logger.warning(f"TTS queue {state.id} timeout after {QUEUE_TIMEOUT_SECONDS}s of inactivity")
                     state.status = "error"
                     state.error_message = f"Queue timeout: no activity for {QUEUE_TIMEOUT_SECONDS}s"
+                    await _wake_pollers(state)
                     break
-                # Continue waiting - queue might still be active
-                continue
+                else:
+                    # Continue waiting - queue might still be active
+                    continue
+
+            # Batch-drain everything already queued so one wakeup (and one
+            # chunker/tokenizer pass) covers a whole burst of streamed tokens
+            batch: list[str] = []
+            eof = text_item is None
+            if not eof:
+                batch.append(text_item)
+            while not eof:
+                try:
+                    next_item = state.text_queue.get_nowait()
+                except asyncio.QueueEmpty:
+                    break
+                if next_item is None:
+                    eof = True
+                else:
+                    batch.append(next_item)
+            # end_tts_queue can't enqueue its EOF sentinel while the queue
+            # is full; once everything queued ahead of it is drained, the
+            # end_signaled flag stands in for the lost sentinel
+            if not eof and state.end_signaled and state.text_queue.empty():
+                eof = True
+
+            if batch:
+                # Feed text to chunker in one concatenated pass
+                ready_chunks = chunker.add_text("".join(batch))
+                for chunk_text in ready_chunks:
+                    await _process_tts_chunk(state, chunk_text, chunk_index, char_offset, model_state)
+                    char_offset += len(chunk_text)
+                    chunk_index += 1
 
-            if text_item is None:
+            if eof:
                 # EOF - flush remaining text
                 remaining = chunker.flush()
                 for chunk_text in remaining:
@@ -595,20 +863,14 @@ async def _run_tts_queue(state: TTSQueueState):
 
                 state.status = "complete"
                 logger.info(f"TTS queue {state.id} complete: {chunk_index} chunks")
+                await _wake_pollers(state)
                 break
 
-            # Feed text to chunker
-            ready_chunks = chunker.add_text(text_item)
-
-            for chunk_text in ready_chunks:
-                await _process_tts_chunk(state, chunk_text, chunk_index, char_offset, model_state)
-                char_offset += len(chunk_text)
-                chunk_index += 1
-
     except Exception as e:
         logger.error(f"TTS queue {state.id} error: {e}")
         state.status = "error"
         state.error_message = str(e)
+        await _wake_pollers(state)
 
 
 async def _process_tts_chunk(
@@ -622,40 +884,68 @@ async def _process_tts_chunk(
     if tts_model is None:
         return
 
+    cache_key = _audio_cache_key(state.voice, text)
+    cached = _audio_cache.get(cache_key)
+    if cached is not None:
+        _audio_cache.move_to_end(cache_key)
+        audio_base64, duration_ms = cached
+        state.chunk_indices.append(chunk_index)
+        state.chunk_char_starts.append(char_offset)
+        state.chunk_char_ends.append(char_offset + len(text))
+        state.chunk_durations_ms.append(duration_ms)
+        state.chunk_audio_b64.append(audio_base64)
+        await _wake_pollers(state)
+        logger.debug(f"TTS queue {state.id}: chunk {chunk_index} served from cache")
+        return
+
     loop = asyncio.get_event_loop()
-    audio_bytes_list: list[bytes] = []
+    combined_audio = b""
     total_samples = 0
 
     def generate_sync():
-        nonlocal total_samples
+        nonlocal combined_audio, total_samples
         _, frames_after_eos = prepare_text_prompt(text)
         frames_after_eos += 2
 
+        # Accumulate frames on-device and convert once at the end: a
+        # single fused multiply+clamp+int16 cast and one device->host
+        # transfer, instead of a sync + torch->numpy->bytes chain per frame
+        frames: list[torch.Tensor] = []
         for audio_chunk in tts_model._generate_audio_stream_short_text(
             model_state=model_state,
             text_to_generate=text,
             frames_after_eos=frames_after_eos,
-            copy_state=True,
+            # The queue owns model_state (cloned once at queue start), so
+            # generation can mutate it in place across chunks
+            copy_state=False,
         ):
-            audio_int16 = (audio_chunk * 32767).to(torch.int16)
-            audio_bytes_list.append(audio_int16.cpu().numpy().tobytes())
+            frames.append(audio_chunk)
             total_samples += len(audio_chunk)
 
-    await loop.run_in_executor(None, generate_sync)
-
-    combined_audio = b"".join(audio_bytes_list)
-    duration_ms = (total_samples / state.sample_rate) * 1000
+        if frames:
+            pcm = torch.clamp(torch.cat(frames) * 32767.0, -32768, 32767).to(torch.int16)
+            # mu-law on the wire: one byte per sample instead of two
+            combined_audio = _linear_to_ulaw(pcm.cpu().numpy()).tobytes()
 
-    chunk_data = AudioChunkData(
-        index=chunk_index,
-        audio_base64=base64.b64encode(combined_audio).decode(),
-        char_start=char_offset,
-        char_end=char_offset + len(text),
-        duration_ms=duration_ms,
-    )
+    await loop.run_in_executor(_TTS_EXECUTOR, generate_sync)
 
-    async with state.lock:
-        state.audio_chunks.append(chunk_data)
+    duration_ms = (total_samples / state.sample_rate) * 1000
+    # pybase64 dispatches to SIMD (AVX2/NEON) base64 kernels, and
+    # b64encode_as_string skips the intermediate bytes->str copy
+    audio_base64 = pybase64.b64encode_as_string(combined_audio)
+
+    _audio_cache[cache_key] = (audio_base64, duration_ms)
+    while len(_audio_cache) > _AUDIO_CACHE_MAX_ENTRIES:
+        _audio_cache.popitem(last=False)
+
+    state.chunk_indices.append(chunk_index)
+    state.chunk_char_starts.append(char_offset)
+    state.chunk_char_ends.append(char_offset + len(text))
+    state.chunk_durations_ms.append(duration_ms)
+    # Appended last: once the base64 lands, the whole row is visible to
+    # the poller
+    state.chunk_audio_b64.append(audio_base64)
+    await _wake_pollers(state)
 
     logger.debug(f"TTS queue {state.id}: chunk {chunk_index} ready ({duration_ms:.0f}ms)")
 
@@ -793,6 +1083,22 @@ EMBEDDED_VIEW_HTML = """<!DOCTYPE html>
     import { useApp } from '@modelcontextprotocol/ext-apps/react';
     import { applyDocumentTheme, applyHostStyleVariables, applyHostFonts } from '@modelcontextprotocol/ext-apps';
 
+    // Native base64 decode (ES2025 proposal; Safari 18.4+, Node 22+):
+    // one engine call instead of the atob + charCodeAt JS loop
+    const HAS_SET_FROM_BASE64 = typeof Uint8Array.prototype.setFromBase64 === 'function';
+
+    // G.711 mu-law byte -> float sample lookup table (server sends 8-bit
+    // mu-law; decode is then one table load per sample)
+    const ULAW_LUT = new Float32Array(256);
+    for (let i = 0; i < 256; i++) {
+      const u = ~i & 0xFF;
+      const exponent = (u >> 4) & 0x07;
+      const mantissa = u & 0x0F;
+      let sample = (((mantissa << 3) + 0x84) << exponent) - 0x84;
+      if (u & 0x80) sample = -sample;
+      ULAW_LUT[i] = sample / 32768;
+    }
+
     function SayView() {
       const [hostContext, setHostContext] = useState(undefined);
       const [displayText, setDisplayText] = useState("");
@@ -805,212 +1111,375 @@ EMBEDDED_VIEW_HTML = """<!DOCTYPE html>
       const [showInfo, setShowInfo] = useState(false);
 
       const voiceRef = useRef("cosette"); // Current voice, updated from tool input
+      const statusRef = useRef("idle"); // Render-time mirror of status for stable callbacks
       const viewUuidRef = useRef(null); // View UUID for speak lock coordination
-      const speakLockIntervalRef = useRef(null); // Polling interval for speak lock
+      const speakLockIntervalRef = useRef(null); // Fallback polling interval for speak lock
+      const speakLockChannelRef = useRef(null); // BroadcastChannel for speak lock claims
       const queueIdRef = useRef(null);
       const audioContextRef = useRef(null);
       const sampleRateRef = useRef(24000);
       const nextPlayTimeRef = useRef(0);
       const playbackStartTimeRef = useRef(0);
       const chunkTimingsRef = useRef([]);
+      const lastTimingIndexRef = useRef(0); // Last matched chunk in getCharacterPosition
+      const wordBoundariesRef = useRef(new Uint32Array(0)); // Word-boundary bitmap
+      const wordBoundariesTextRef = useRef(""); // Text the bitmap was built from
       const pendingChunksRef = useRef([]);
+      const hasPendingChunksRef = useRef(false); // Mirror of hasPendingChunks for edge-triggered sets
+      const scratchBytesRef = useRef(new Uint8Array(0)); // Reused decode scratch
       const allAudioReceivedRef = useRef(false);
       const isPollingRef = useRef(false);
       const lastTextRef = useRef("");
       const fullTextRef = useRef("");
-      const progressIntervalRef = useRef(null);
+      const progressHandleRef = useRef(null); // {raf} or {timer} for the progress loop
+      const visibilityHandlerRef = useRef(null); // visibilitychange listener while tracking
+      const lastCharPosRef = useRef(-1); // Last char position pushed to state
       const appRef = useRef(null);
       const lastModelContextUpdateRef = useRef(0);
+      const pendingDisplayTextRef = useRef(""); // Latest text awaiting the display rAF
+      const displayTextRafRef = useRef(null); // rAF id for the coalesced display update
       const audioOperationInProgressRef = useRef(false);
       const initQueuePromiseRef = useRef(null);
+      const sessionIdRef = useRef(0); // Bumped on new-session detection to abort stale inits
       const pendingModelContextUpdateRef = useRef(null);
 
-      // Speak lock: coordinates multiple TTS views so only one plays at a time
-      const SPEAK_LOCK_KEY = "mcp-tts-playing";
+      // Speak lock: coordinates multiple TTS views so only one plays at a time.
+      // Claims travel over a BroadcastChannel (event-driven, no wake-ups);
+      // localStorage is kept as a fallback for hosts without BroadcastChannel,
+      // stored as two plain keys so reads skip JSON entirely.
+      const SPEAK_LOCK_UUID_KEY = "tts.lock.uuid";
+      const SPEAK_LOCK_TS_KEY = "tts.lock.ts";
+      const SPEAK_LOCK_CHANNEL = "tts-speak-lock";
+
+      const getSpeakLockChannel = useCallback(() => {
+        if (typeof BroadcastChannel === "undefined") return null;
+        if (!speakLockChannelRef.current) {
+          speakLockChannelRef.current = new BroadcastChannel(SPEAK_LOCK_CHANNEL);
+        }
+        return speakLockChannelRef.current;
+      }, []);
 
       const announcePlayback = useCallback(() => {
         if (!viewUuidRef.current) return;
-        localStorage.setItem(SPEAK_LOCK_KEY, JSON.stringify({
-          uuid: viewUuidRef.current,
-          timestamp: Date.now()
-        }));
-      }, []);
+        const bc = getSpeakLockChannel();
+        if (bc) {
+          bc.postMessage({ type: "claim", uuid: viewUuidRef.current });
+          return;
+        }
+        localStorage.setItem(SPEAK_LOCK_UUID_KEY, viewUuidRef.current);
+        localStorage.setItem(SPEAK_LOCK_TS_KEY, String(Date.now()));
+      }, [getSpeakLockChannel]);
 
       const clearSpeakLock = useCallback(() => {
         if (!viewUuidRef.current) return;
         try {
-          const current = JSON.parse(localStorage.getItem(SPEAK_LOCK_KEY) || "null");
-          if (current?.uuid === viewUuidRef.current) {
-            localStorage.removeItem(SPEAK_LOCK_KEY);
+          if (localStorage.getItem(SPEAK_LOCK_UUID_KEY) === viewUuidRef.current) {
+            localStorage.removeItem(SPEAK_LOCK_UUID_KEY);
+            localStorage.removeItem(SPEAK_LOCK_TS_KEY);
           }
         } catch {}
       }, []);
 
       const startSpeakLockPolling = useCallback((onStolenCallback) => {
+        const bc = getSpeakLockChannel();
+        if (bc) {
+          // Event-driven: we only wake when another view actually claims
+          bc.onmessage = (e) => {
+            if (e.data?.type === "claim" && e.data.uuid !== viewUuidRef.current) {
+              console.log('[TTS] Another view started playing, pausing');
+              onStolenCallback();
+            }
+          };
+          return;
+        }
+        // Fallback: poll localStorage at 5 Hz
         if (speakLockIntervalRef.current) clearInterval(speakLockIntervalRef.current);
         speakLockIntervalRef.current = setInterval(() => {
           try {
-            const current = JSON.parse(localStorage.getItem(SPEAK_LOCK_KEY) || "null");
-            if (current && current.uuid !== viewUuidRef.current) {
+            // Bare string compare; no JSON on the 5 Hz path
+            const current = localStorage.getItem(SPEAK_LOCK_UUID_KEY);
+            if (current && current !== viewUuidRef.current) {
               // Someone else started playing - yield
               console.log('[TTS] Another view started playing, pausing');
               onStolenCallback();
             }
           } catch {}
         }, 200);
-      }, []);
+      }, [getSpeakLockChannel]);
 
       const stopSpeakLockPolling = useCallback(() => {
+        if (speakLockChannelRef.current) {
+          speakLockChannelRef.current.onmessage = null;
+        }
         if (speakLockIntervalRef.current) {
           clearInterval(speakLockIntervalRef.current);
           speakLockIntervalRef.current = null;
         }
       }, []);
 
+      // Coalesce display-text updates to frame rate: streamed partials can
+      // arrive much faster than the DOM needs to repaint, and each direct
+      // setDisplayText would re-render both text spans
+      const scheduleDisplayText = useCallback((text) => {
+        pendingDisplayTextRef.current = text;
+        if (displayTextRafRef.current) return;
+        displayTextRafRef.current = requestAnimationFrame(() => {
+          displayTextRafRef.current = null;
+          setDisplayText(pendingDisplayTextRef.current);
+        });
+      }, []);
+
       const roundToWordEnd = useCallback((pos) => {
         const text = lastTextRef.current;
         if (pos >= text.length) return text.length;
         if (pos <= 0) return 0;
-        if (text[pos] === " " || text[pos] === "\\n") return pos;
-        let end = pos;
-        while (end < text.length && text[end] !== " " && text[end] !== "\\n") end++;
-        return end;
+        // Word boundaries live in a bitmap (1 bit per char) rebuilt only
+        // when the text changes; finding the next boundary is then a
+        // 32-chars-per-step word scan instead of a per-char loop every tick
+        if (wordBoundariesTextRef.current !== text) {
+          const words = new Uint32Array((text.length >> 5) + 1);
+          for (let i = 0; i < text.length; i++) {
+            const c = text[i];
+            if (c === " " || c === "\\n") words[i >> 5] |= 1 << (i & 31);
+          }
+          wordBoundariesRef.current = words;
+          wordBoundariesTextRef.current = text;
+        }
+        const words = wordBoundariesRef.current;
+        let w = pos >> 5;
+        let masked = words[w] & (~0 << (pos & 31));
+        while (masked === 0) {
+          w++;
+          if (w >= words.length) return text.length;
+          masked = words[w];
+        }
+        // count-trailing-zeros via clz32 on the lowest set bit
+        return (w << 5) + (31 - Math.clz32(masked & -masked));
       }, []);
 
       const getCharacterPosition = useCallback((currentTime) => {
         const timings = chunkTimingsRef.current;
-        let rawPos = 0;
         if (timings.length === 0) {
-          rawPos = Math.floor((currentTime - playbackStartTimeRef.current) * 12);
-        } else {
-          for (const chunk of timings) {
-            if (currentTime >= chunk.audioStartTime && currentTime < chunk.audioEndTime) {
-              const duration = chunk.audioEndTime - chunk.audioStartTime;
-              if (duration <= 0) { rawPos = chunk.charStart; }
-              else {
-                const progress = (currentTime - chunk.audioStartTime) / duration;
-                rawPos = Math.floor(chunk.charStart + progress * (chunk.charEnd - chunk.charStart));
-              }
-              break;
-            }
-          }
-          if (rawPos === 0 && timings.length > 0) {
-            if (currentTime < timings[0].audioStartTime) rawPos = 0;
-            else {
-              const last = timings[timings.length - 1];
-              if (currentTime >= last.audioEndTime) rawPos = last.charEnd;
+          return roundToWordEnd(Math.floor((currentTime - playbackStartTimeRef.current) * 12));
+        }
+        // Fast path: currentTime advances slowly between ticks, so the
+        // chunk found last tick (or its successor) almost always matches
+        let idx = Math.min(lastTimingIndexRef.current, timings.length - 1);
+        const inChunk = (i) => currentTime >= timings[i].audioStartTime && currentTime < timings[i].audioEndTime;
+        if (!inChunk(idx)) {
+          if (idx + 1 < timings.length && inChunk(idx + 1)) {
+            idx += 1;
+          } else {
+            // Chunks are appended in playback order, so audioStartTime is
+            // sorted: bisect for the last chunk starting at or before now
+            let lo = 0, hi = timings.length - 1;
+            while (lo < hi) {
+              const mid = (lo + hi + 1) >> 1;
+              if (timings[mid].audioStartTime <= currentTime) lo = mid; else hi = mid - 1;
             }
+            idx = lo;
           }
         }
+        lastTimingIndexRef.current = idx;
+        const chunk = timings[idx];
+        let rawPos;
+        if (currentTime < chunk.audioStartTime) rawPos = 0;
+        else if (currentTime >= chunk.audioEndTime) rawPos = chunk.charEnd;
+        else {
+          const duration = chunk.audioEndTime - chunk.audioStartTime;
+          rawPos = duration <= 0 ? chunk.charStart
+            : Math.floor(chunk.charStart + ((currentTime - chunk.audioStartTime) / duration) * (chunk.charEnd - chunk.charStart));
+        }
         return roundToWordEnd(rawPos);
       }, [roundToWordEnd]);
 
+      const stopProgressTracking = useCallback(() => {
+        if (visibilityHandlerRef.current) {
+          document.removeEventListener("visibilitychange", visibilityHandlerRef.current);
+          visibilityHandlerRef.current = null;
+        }
+        const handle = progressHandleRef.current;
+        if (!handle) return;
+        if (handle.raf !== undefined) cancelAnimationFrame(handle.raf);
+        else clearTimeout(handle.timer);
+        progressHandleRef.current = null;
+      }, []);
+
       const finishPlayback = useCallback(() => {
         setStatus("finished");
-        if (progressIntervalRef.current) {
-          clearInterval(progressIntervalRef.current);
-          progressIntervalRef.current = null;
-        }
+        stopProgressTracking();
+        lastCharPosRef.current = lastTextRef.current.length;
         setCharPosition(lastTextRef.current.length);
-      }, []);
+      }, [stopProgressTracking]);
 
       const startProgressTracking = useCallback(() => {
-        if (progressIntervalRef.current) return;
-        progressIntervalRef.current = setInterval(() => {
+        if (progressHandleRef.current) return;
+        let lastFinishCheck = 0;
+        const tick = () => {
           const ctx = audioContextRef.current;
-          if (!ctx) return;
-          setCharPosition(getCharacterPosition(ctx.currentTime));
-          if (allAudioReceivedRef.current && ctx.currentTime >= nextPlayTimeRef.current - 0.05) {
-            finishPlayback();
+          if (ctx) {
+            // Highlight against the output-latency-compensated clock:
+            // getOutputTimestamp reports the context time actually reaching
+            // the hardware, so the cursor doesn't lead the audio by the
+            // output latency. currentTime stays the scheduling clock below.
+            let playbackTime = ctx.currentTime;
+            if (typeof ctx.getOutputTimestamp === "function") {
+              const ts = ctx.getOutputTimestamp();
+              if (ts && ts.contextTime > 0) playbackTime = ts.contextTime;
+            }
+            // Only re-render when the rounded char position actually moved;
+            // during inter-word silence this skips the whole React pass
+            const pos = getCharacterPosition(playbackTime);
+            if (pos !== lastCharPosRef.current) {
+              lastCharPosRef.current = pos;
+              setCharPosition(pos);
+            }
+            const now = performance.now();
+            if (now - lastFinishCheck >= 50) {
+              lastFinishCheck = now;
+              if (allAudioReceivedRef.current && ctx.currentTime >= nextPlayTimeRef.current - 0.05) {
+                finishPlayback();
+                return;
+              }
+            }
           }
-        }, 50);
+          // rAF stalls in hidden tabs; fall back to a coarse timer there so
+          // finish detection keeps running
+          progressHandleRef.current = document.hidden
+            ? { timer: setTimeout(tick, 50) }
+            : { raf: requestAnimationFrame(tick) };
+        };
+        // A rAF scheduled while visible never fires once the tab hides, so
+        // no tick would ever observe document.hidden and switch to the
+        // timer. Re-arm the pending handle on every visibility flip.
+        const onVisibility = () => {
+          const handle = progressHandleRef.current;
+          if (!handle) return;
+          if (handle.raf !== undefined) cancelAnimationFrame(handle.raf);
+          else clearTimeout(handle.timer);
+          progressHandleRef.current = document.hidden
+            ? { timer: setTimeout(tick, 50) }
+            : { raf: requestAnimationFrame(tick) };
+        };
+        document.addEventListener("visibilitychange", onVisibility);
+        visibilityHandlerRef.current = onVisibility;
+        progressHandleRef.current = { raf: requestAnimationFrame(tick) };
       }, [getCharacterPosition, finishPlayback]);
 
-      const scheduleAudioChunkInternal = useCallback(async (chunk) => {
-        const ctx = audioContextRef.current;
-        if (!ctx) return;
-        const binaryString = atob(chunk.audio_base64);
-        const bytes = new Uint8Array(binaryString.length);
+      // Decode one base64 payload into the reused byte scratch (grown to
+      // the largest chunk seen); returns the decoded length
+      const decodeBase64Into = useCallback((b64) => {
+        const maxBytes = (b64.length * 3) >> 2;
+        if (scratchBytesRef.current.length < maxBytes) {
+          scratchBytesRef.current = new Uint8Array(maxBytes);
+        }
+        const bytes = scratchBytesRef.current;
+        if (HAS_SET_FROM_BASE64) return bytes.setFromBase64(b64).written;
+        const binaryString = atob(b64);
         for (let i = 0; i < binaryString.length; i++) bytes[i] = binaryString.charCodeAt(i);
-        const int16Array = new Int16Array(bytes.buffer);
-        const float32Array = new Float32Array(int16Array.length);
-        for (let i = 0; i < int16Array.length; i++) float32Array[i] = int16Array[i] / 32768;
-        const audioBuffer = ctx.createBuffer(1, float32Array.length, sampleRateRef.current);
-        audioBuffer.getChannelData(0).set(float32Array);
+        return binaryString.length;
+      }, []);
+
+      // Fully synchronous: decode and WebAudio scheduling never await.
+      // All chunks delivered by one poll share a single AudioBuffer and
+      // BufferSource; per-chunk char timings are still exact because they
+      // are derived from each chunk's decoded sample count.
+      const scheduleAudioChunksInternal = useCallback((chunks) => {
+        const ctx = audioContextRef.current;
+        if (!ctx || chunks.length === 0) return;
+        // Padded base64 length gives the decoded size up front
+        // (mu-law: one byte per sample)
+        const sampleCounts = chunks.map((c) => {
+          const s = c.audio_base64;
+          let n = (s.length >> 2) * 3;
+          if (s.endsWith("==")) n -= 2; else if (s.endsWith("=")) n -= 1;
+          return n;
+        });
+        const totalSamples = sampleCounts.reduce((a, b) => a + b, 0);
+        if (totalSamples === 0) return;
+        const audioBuffer = ctx.createBuffer(1, totalSamples, sampleRateRef.current);
+        const channel = audioBuffer.getChannelData(0);
+        let offset = 0;
+        for (const chunk of chunks) {
+          const byteLen = decodeBase64Into(chunk.audio_base64);
+          const bytes = scratchBytesRef.current;
+          // mu-law expands through the 256-entry table, straight into the
+          // WebAudio-owned channel data
+          for (let i = 0; i < byteLen; i++) channel[offset + i] = ULAW_LUT[bytes[i]];
+          offset += byteLen;
+        }
         const source = ctx.createBufferSource();
         source.buffer = audioBuffer;
         source.connect(ctx.destination);
         const startTime = Math.max(ctx.currentTime, nextPlayTimeRef.current);
-        const duration = audioBuffer.duration;
         if (chunkTimingsRef.current.length === 0) {
           playbackStartTimeRef.current = startTime;
           setStatus("playing");
           startProgressTracking();
         }
         source.start(startTime);
-        nextPlayTimeRef.current = startTime + duration;
-        chunkTimingsRef.current.push({
-          charStart: chunk.char_start, charEnd: chunk.char_end,
-          audioStartTime: startTime, audioEndTime: nextPlayTimeRef.current,
-        });
-        const thisBufferEndTime = nextPlayTimeRef.current;
-        source.onended = () => {
-          if (!audioContextRef.current) return;
-          const ct = audioContextRef.current.currentTime;
-          if (allAudioReceivedRef.current && thisBufferEndTime >= nextPlayTimeRef.current - 0.01 && ct >= nextPlayTimeRef.current - 0.05) {
-            finishPlayback();
-          }
-        };
-      }, [startProgressTracking, finishPlayback]);
+        let t = startTime;
+        for (let c = 0; c < chunks.length; c++) {
+          const end = t + sampleCounts[c] / sampleRateRef.current;
+          chunkTimingsRef.current.push({
+            charStart: chunks[c].char_start, charEnd: chunks[c].char_end,
+            audioStartTime: t, audioEndTime: end,
+          });
+          t = end;
+        }
+        nextPlayTimeRef.current = t;
+        // No source.onended: the progress loop already detects completion
+        // via nextPlayTimeRef, so per-chunk closures would be redundant
+      }, [decodeBase64Into, startProgressTracking]);
 
-      const scheduleAudioChunk = useCallback(async (chunk) => {
+      const scheduleAudioChunks = useCallback((chunks) => {
         const ctx = audioContextRef.current;
-        if (!ctx) return;
+        if (!ctx || chunks.length === 0) return;
         // Only defer to pendingChunks if suspended AND playback hasn't started yet
         // (i.e., autoplay is blocked). If we're paused by user (chunkTimings exists),
         // schedule normally - the audio will queue up and play when resumed.
         if (ctx.state === "suspended" && chunkTimingsRef.current.length === 0) {
-          pendingChunksRef.current.push(chunk);
-          setHasPendingChunks(true);
+          pendingChunksRef.current.push(...chunks);
+          // Only touch React state on the false->true edge
+          if (!hasPendingChunksRef.current) {
+            hasPendingChunksRef.current = true;
+            setHasPendingChunks(true);
+          }
           return;
         }
-        await scheduleAudioChunkInternal(chunk);
-      }, [scheduleAudioChunkInternal]);
+        scheduleAudioChunksInternal(chunks);
+      }, [scheduleAudioChunksInternal]);
 
       const startPolling = useCallback(async () => {
         const app = appRef.current;
         if (isPollingRef.current || !app) return;
         isPollingRef.current = true;
 
-        let emptyPollCount = 0;
+        // Long-poll loop: the server holds each empty poll until a chunk is
+        // produced (or ~500ms passes), so re-polling immediately is the
+        // pacing — no client-side backoff timers needed
         while (queueIdRef.current) {
           try {
             const result = await app.callServerTool({ name: "poll_tts_audio", arguments: { queue_id: queueIdRef.current } });
-            const data = JSON.parse(result.content[0].text);
-            if (data.error) {
-              console.log('[TTS] Queue error:', data.error);
+            // content[0] is a tiny control message; the chunk payload in
+            // content[1] only exists (and only gets parsed) when n > 0
+            const control = JSON.parse(result.content[0].text);
+            if (control.error) {
+              console.log('[TTS] Queue error:', control.error);
               break;
             }
-            for (const chunk of data.chunks) await scheduleAudioChunk(chunk);
-            if (data.done) { allAudioReceivedRef.current = true; break; }
-
-            // Adaptive backoff: faster when streaming, slower when waiting
-            if (data.chunks.length > 0) {
-              emptyPollCount = 0;  // Reset - we're getting chunks
-              await new Promise(r => setTimeout(r, 20));  // Fast poll during streaming
-            } else {
-              emptyPollCount++;
-              // Exponential backoff for empty polls: 50ms, 100ms, 150ms max
-              const delay = Math.min(50 + (emptyPollCount * 50), 150);
-              await new Promise(r => setTimeout(r, delay));
+            if (control.n > 0) {
+              // One AudioBuffer/BufferSource for the whole batch
+              scheduleAudioChunks(JSON.parse(result.content[1].text));
             }
+            if (control.done) { allAudioReceivedRef.current = true; break; }
           } catch (err) {
             console.log('[TTS] Polling error:', err);
             break;
           }
         }
         isPollingRef.current = false;
-      }, [scheduleAudioChunk]);
+      }, [scheduleAudioChunks]);
 
       const cancelCurrentQueue = useCallback(async () => {
         const app = appRef.current;
@@ -1020,7 +1489,7 @@ EMBEDDED_VIEW_HTML = """<!DOCTYPE html>
         }
       }, []);
 
-      const initTTSQueue = useCallback(async () => {
+      const initTTSQueue = useCallback(async (initialText = "") => {
         console.log('[TTS] initTTSQueue called, queueIdRef:', queueIdRef.current);
         // Already initialized
         if (queueIdRef.current) { console.log('[TTS] already initialized'); return true; }
@@ -1031,7 +1500,10 @@ EMBEDDED_VIEW_HTML = """<!DOCTYPE html>
         }
         const app = appRef.current;
         if (!app) return false;
-        // Start initialization with promise lock
+        // Start initialization with promise lock. The captured session id
+        // lets a newer session invalidate this init at each await boundary
+        // instead of racing it for the queue refs.
+        const mySession = sessionIdRef.current;
         initQueuePromiseRef.current = (async () => {
           try {
             // Close any existing audio context from previous session
@@ -1039,19 +1511,21 @@ EMBEDDED_VIEW_HTML = """<!DOCTYPE html>
               try { await audioContextRef.current.close(); } catch {}
               audioContextRef.current = null;
             }
-            if (progressIntervalRef.current) {
-              clearInterval(progressIntervalRef.current);
-              progressIntervalRef.current = null;
-            }
+            if (sessionIdRef.current !== mySession) { console.log('[TTS] stale init aborted'); return false; }
+            stopProgressTracking();
             // Reset state for new session
+            lastCharPosRef.current = -1;
+            lastTimingIndexRef.current = 0;
             chunkTimingsRef.current = [];
             pendingChunksRef.current = [];
+            hasPendingChunksRef.current = false;
             allAudioReceivedRef.current = false;
             setCharPosition(0);
             setStatus("idle");
-            // Create new queue
+            // Create new queue; sending the known text along saves one
+            // add_tts_text round trip before the first audio chunk
             console.log('[TTS] creating new queue');
-            const result = await app.callServerTool({ name: "create_tts_queue", arguments: { voice: voiceRef.current } });
+            const result = await app.callServerTool({ name: "create_tts_queue", arguments: { voice: voiceRef.current, initial_text: initialText } });
             console.log('[TTS] create_tts_queue result:', result);
             const text = result.content?.[0]?.text;
             if (!text) { console.error('[TTS] No text in result'); return false; }
@@ -1059,8 +1533,16 @@ EMBEDDED_VIEW_HTML = """<!DOCTYPE html>
             try { data = JSON.parse(text); }
             catch (e) { console.error('[TTS] Failed to parse result:', text); return false; }
             if (data.error) { console.log('[TTS] queue creation error:', data.error); return false; }
+            if (sessionIdRef.current !== mySession) {
+              // A newer session started while the queue was being created;
+              // throw the orphan queue away rather than adopting it
+              console.log('[TTS] stale init, discarding queue', data.queue_id);
+              app.callServerTool({ name: "cancel_tts_queue", arguments: { queue_id: data.queue_id } }).catch(() => {});
+              return false;
+            }
             queueIdRef.current = data.queue_id;
             sampleRateRef.current = data.sample_rate || 24000;
+            if (initialText) lastTextRef.current = initialText;
             console.log('[TTS] creating new AudioContext');
             audioContextRef.current = new AudioContext({ sampleRate: sampleRateRef.current });
             nextPlayTimeRef.current = 0;
@@ -1070,7 +1552,7 @@ EMBEDDED_VIEW_HTML = """<!DOCTYPE html>
           finally { initQueuePromiseRef.current = null; }
         })();
         return initQueuePromiseRef.current;
-      }, [startPolling]);
+      }, [startPolling, stopProgressTracking]);
 
       const sendTextToTTS = useCallback(async (text) => {
         const app = appRef.current;
@@ -1093,11 +1575,13 @@ EMBEDDED_VIEW_HTML = """<!DOCTYPE html>
             nextPlayTimeRef.current = ctx.currentTime;
             const chunks = pendingChunksRef.current;
             pendingChunksRef.current = [];
+            hasPendingChunksRef.current = false;
             setHasPendingChunks(false);
-            for (const chunk of chunks) await scheduleAudioChunkInternal(chunk);
+            // Scheduling is synchronous; play the backlog as one batch
+            scheduleAudioChunksInternal(chunks);
           }
         }
-      }, [scheduleAudioChunkInternal]);
+      }, [scheduleAudioChunksInternal]);
 
       const restartPlayback = useCallback(async () => {
         console.log('[TTS] restartPlayback called');
@@ -1105,42 +1589,47 @@ EMBEDDED_VIEW_HTML = """<!DOCTYPE html>
         if (audioOperationInProgressRef.current) { console.log('[TTS] restartPlayback blocked'); return; }
         audioOperationInProgressRef.current = true;
         try {
-          if (progressIntervalRef.current) { clearInterval(progressIntervalRef.current); progressIntervalRef.current = null; }
+          stopProgressTracking();
+          lastCharPosRef.current = -1;
+          lastTimingIndexRef.current = 0;
           await cancelCurrentQueue();
           if (audioContextRef.current) { await audioContextRef.current.close(); audioContextRef.current = null; }
           const textToReplay = fullTextRef.current || lastTextRef.current;
           if (!textToReplay) return;
+          sessionIdRef.current++; // Invalidate any in-flight init for the old session
           queueIdRef.current = null; lastTextRef.current = ""; isPollingRef.current = false;
           nextPlayTimeRef.current = 0; playbackStartTimeRef.current = 0;
           setStatus("idle"); chunkTimingsRef.current = []; allAudioReceivedRef.current = false;
-          setCharPosition(0); pendingChunksRef.current = []; setHasPendingChunks(false);
-          setDisplayText(textToReplay);
+          setCharPosition(0); pendingChunksRef.current = []; hasPendingChunksRef.current = false; setHasPendingChunks(false);
+          scheduleDisplayText(textToReplay);
           const app = appRef.current;
           if (!app) return;
-          const result = await app.callServerTool({ name: "create_tts_queue", arguments: { voice: voiceRef.current } });
+          const result = await app.callServerTool({ name: "create_tts_queue", arguments: { voice: voiceRef.current, initial_text: textToReplay } });
           const data = JSON.parse(result.content[0].text);
           if (data.error) return;
           queueIdRef.current = data.queue_id;
           sampleRateRef.current = data.sample_rate || 24000;
+          lastTextRef.current = textToReplay;
           audioContextRef.current = new AudioContext({ sampleRate: sampleRateRef.current });
           nextPlayTimeRef.current = 0;
-          await app.callServerTool({ name: "add_tts_text", arguments: { queue_id: queueIdRef.current, text: textToReplay } });
-          lastTextRef.current = textToReplay;
           await app.callServerTool({ name: "end_tts_queue", arguments: { queue_id: queueIdRef.current } });
           startPolling();
         } catch (err) {
         } finally {
           audioOperationInProgressRef.current = false;
         }
-      }, [cancelCurrentQueue, startPolling]);
+      }, [cancelCurrentQueue, startPolling, stopProgressTracking, scheduleDisplayText]);
 
       const togglePlayPause = useCallback(async () => {
-        console.log('[TTS] togglePlayPause called, status:', status, 'ctx:', audioContextRef.current?.state);
+        // Read status through the ref so this callback (and everything
+        // memoized on it) keeps one identity across status changes
+        const currentStatus = statusRef.current;
+        console.log('[TTS] togglePlayPause called, status:', currentStatus, 'ctx:', audioContextRef.current?.state);
         // Prevent concurrent audio operations
         if (audioOperationInProgressRef.current) { console.log('[TTS] blocked by audioOpInProgress'); return; }
         let ctx = audioContextRef.current;
         try {
-          if (status === "finished") { console.log('[TTS] finished, calling restartPlayback'); await restartPlayback(); return; }
+          if (currentStatus === "finished") { console.log('[TTS] finished, calling restartPlayback'); await restartPlayback(); return; }
           // If no context yet, wait for init to complete (up to 3s)
           if (!ctx) {
             console.log('[TTS] no ctx, waiting for init');
@@ -1154,10 +1643,10 @@ EMBEDDED_VIEW_HTML = """<!DOCTYPE html>
             console.log('[TTS] resuming via ensureAudioContextResumed');
             await ensureAudioContextResumed(); setStatus("playing"); return;
           }
-          if (status === "paused") { console.log('[TTS] resuming paused'); await ctx.resume(); setStatus("playing"); }
-          else if (status === "playing") { console.log('[TTS] pausing'); await ctx.suspend(); setStatus("paused"); }
+          if (currentStatus === "paused") { console.log('[TTS] resuming paused'); await ctx.resume(); setStatus("playing"); }
+          else if (currentStatus === "playing") { console.log('[TTS] pausing'); await ctx.suspend(); setStatus("paused"); }
         } catch (err) { console.error('[TTS] togglePlayPause error:', err); }
-      }, [status, restartPlayback, ensureAudioContextResumed]);
+      }, [restartPlayback, ensureAudioContextResumed]);
 
       const toggleFullscreen = useCallback(async () => {
         const app = appRef.current;
@@ -1190,12 +1679,13 @@ EMBEDDED_VIEW_HTML = """<!DOCTYPE html>
             const isNewSession = lastTextRef.current.length > 0 && !newText.startsWith(lastTextRef.current);
             if (isNewSession) {
               console.log('[TTS] new session detected in partial - resetting queue');
-              // Reset for new session
+              // Reset for new session; the bump aborts any in-flight init
+              sessionIdRef.current++;
               queueIdRef.current = null;
               lastTextRef.current = "";
             }
-            setDisplayText(newText);
-            if (!queueIdRef.current && !(await initTTSQueue())) {
+            scheduleDisplayText(newText);
+            if (!queueIdRef.current && !(await initTTSQueue(newText))) {
               console.log('[TTS] initTTSQueue failed in partial');
               return;
             }
@@ -1215,11 +1705,12 @@ EMBEDDED_VIEW_HTML = """<!DOCTYPE html>
             const isNewSession = lastTextRef.current.length > 0 && !text.startsWith(lastTextRef.current);
             if (isNewSession) {
               console.log('[TTS] new session detected in input - resetting queue');
+              sessionIdRef.current++;
               queueIdRef.current = null;
               lastTextRef.current = "";
             }
-            setDisplayText(text);
-            if (!queueIdRef.current && !(await initTTSQueue())) {
+            scheduleDisplayText(text);
+            if (!queueIdRef.current && !(await initTTSQueue(text))) {
               console.log('[TTS] initTTSQueue failed in input');
               return;
             }
@@ -1247,9 +1738,17 @@ EMBEDDED_VIEW_HTML = """<!DOCTYPE html>
             // New session detection happens in ontoolinputpartial via text comparison
           };
           app.onteardown = async () => {
-            if (progressIntervalRef.current) clearInterval(progressIntervalRef.current);
+            stopProgressTracking();
+            if (displayTextRafRef.current) {
+              cancelAnimationFrame(displayTextRafRef.current);
+              displayTextRafRef.current = null;
+            }
             stopSpeakLockPolling();
             clearSpeakLock();
+            if (speakLockChannelRef.current) {
+              speakLockChannelRef.current.close();
+              speakLockChannelRef.current = null;
+            }
             await cancelCurrentQueue();
             if (audioContextRef.current) { await audioContextRef.current.close(); audioContextRef.current = null; }
             return {};
@@ -1318,7 +1817,9 @@ EMBEDDED_VIEW_HTML = """<!DOCTYPE html>
           }
         }
         return () => stopSpeakLockPolling();
-      }, [status, announcePlayback, startSpeakLockPolling, stopSpeakLockPolling, clearSpeakLock]);
+        // The lock helpers are refs-only callbacks with stable identities,
+        // so only status should retrigger this effect
+      }, [status]); // eslint-disable-line react-hooks/exhaustive-deps
 
       useEffect(() => {
         if (!app || !displayText || status === "idle") return;
@@ -1330,14 +1831,23 @@ EMBEDDED_VIEW_HTML = """<!DOCTYPE html>
         const doUpdate = () => {
           lastModelContextUpdateRef.current = Date.now();
           pendingModelContextUpdateRef.current = null;
-          const snippetStart = Math.max(0, charPosition - 30);
-          const snippetEnd = Math.min(displayText.length, charPosition + 10);
-          const snippet = `...` + displayText.slice(snippetStart, charPosition) + `█` + displayText.slice(charPosition, snippetEnd) + `...`;
+          // Read through refs so a timer armed earlier reports values
+          // current at dispatch time, and build the snippet strings only
+          // once we know the update is actually going out
+          const text = pendingDisplayTextRef.current || displayText;
+          const pos = lastCharPosRef.current >= 0 ? lastCharPosRef.current : charPosition;
+          const snippetStart = Math.max(0, pos - 30);
+          const snippetEnd = Math.min(text.length, pos + 10);
+          const snippet = `...` + text.slice(snippetStart, pos) + `█` + text.slice(pos, snippetEnd) + `...`;
           let statusText;
-          if (status === "finished") statusText = `Finished playing ` + displayText.length + ` chars.`;
-          else if (status === "paused") statusText = `PAUSED at "` + snippet + `" (` + charPosition + `/` + displayText.length + `)`;
-          else statusText = `Playing: "` + snippet + `" (` + charPosition + `/` + displayText.length + `)`;
-          app.updateModelContext({ content: [{ type: "text", text: statusText }] }).catch(() => {});
+          if (status === "finished") statusText = `Finished playing ` + text.length + ` chars.`;
+          else if (status === "paused") statusText = `PAUSED at "` + snippet + `" (` + pos + `/` + text.length + `)`;
+          else statusText = `Playing: "` + snippet + `" (` + pos + `/` + text.length + `)`;
+          // The update is advisory; send it when the main thread is idle so
+          // it never contends with audio scheduling
+          const send = () => app.updateModelContext({ content: [{ type: "text", text: statusText }] }).catch(() => {});
+          if (typeof requestIdleCallback === "function") requestIdleCallback(send, { timeout: 500 });
+          else send();
         };
         if (pendingModelContextUpdateRef.current) { clearTimeout(pendingModelContextUpdateRef.current); pendingModelContextUpdateRef.current = null; }
         if (timeSince >= DEBOUNCE_MS) doUpdate();
@@ -1345,6 +1855,9 @@ EMBEDDED_VIEW_HTML = """<!DOCTYPE html>
         return () => { if (pendingModelContextUpdateRef.current) clearTimeout(pendingModelContextUpdateRef.current); };
       }, [app, status, charPosition, displayText]);
 
+      // Mirror status into a ref at render so refs-only callbacks see it
+      statusRef.current = status;
+
       if (error) return <div><strong>ERROR:</strong> {error.message}</div>;
       if (!app) return <div>Connecting...</div>;
 
@@ -1421,14 +1934,31 @@ EMBEDDED_VIEW_HTML = """<!DOCTYPE html>
 </html>"""
 
 
+# Built View path, resolved once at import (produced by npm run build)
+_DIST_VIEW_PATH = Path(__file__).parent / "dist" / "mcp-app.html"
+
+# Cached View HTML so serving the resource is an in-memory return instead of a
+# path resolution + full file read on every request
+_view_html_cache: str | None = None
+
+
+def _read_view_html() -> str:
+    # Prefer built version from dist/ (local development with npm run build),
+    # falling back to the embedded View (for `uv run <url>` or unbundled usage)
+    if _DIST_VIEW_PATH.exists():
+        return _DIST_VIEW_PATH.read_text()
+    return EMBEDDED_VIEW_HTML
+
+
 def get_view_html() -> str:
     """Get the View HTML, preferring built version from dist/."""
-    # Prefer built version from dist/ (local development with npm run build)
-    dist_path = Path(__file__).parent / "dist" / "mcp-app.html"
-    if dist_path.exists():
-        return dist_path.read_text()
-    # Fallback to embedded View (for `uv run <url>` or unbundled usage)
-    return EMBEDDED_VIEW_HTML
+    global _view_html_cache
+    if os.environ.get("VIEW_HTML_RELOAD"):
+        # Dev mode: pick up a rebuilt dist/ without restarting the server
+        return _read_view_html()
+    if _view_html_cache is None:
+        _view_html_cache = _read_view_html()
+    return _view_html_cache
 
 
 # IMPORTANT: all the external domains used by app must be listed
@@ -1452,6 +1982,32 @@ def load_tts_model():
     global tts_model
     logger.info("Loading TTS model...")
     tts_model = TTSModel.load_model()
+
+    # Optional reduced-precision decoder: autoregressive decode is memory-
+    # bandwidth bound (weight + KV reads), so halving bytes per parameter
+    # roughly doubles decode throughput. Only flow_lm is cast; the mimi
+    # audio decoder is left at its default precision.
+    decoder_dtype = os.environ.get("TTS_DECODER_DTYPE", "").lower()
+    if decoder_dtype == "bf16":
+        if torch.cuda.is_available() and torch.cuda.is_bf16_supported():
+            tts_model.flow_lm = tts_model.flow_lm.to(torch.bfloat16)
+            logger.info("flow_lm cast to bfloat16")
+        else:
+            logger.warning("TTS_DECODER_DTYPE=bf16 requested but bf16 is not supported here; keeping default dtype")
+    elif decoder_dtype and decoder_dtype != "fp32":
+        logger.warning(f"Unknown TTS_DECODER_DTYPE={decoder_dtype!r}; keeping default dtype")
+
+    # Optional: compile the autoregressive decoder to cut per-step Python
+    # dispatch and kernel-launch overhead. Off by default since compilation
+    # adds warmup time and not every pocket-tts/torch combination traces
+    # cleanly; falls back to eager on failure.
+    if os.environ.get("TTS_COMPILE"):
+        try:
+            tts_model.flow_lm = torch.compile(tts_model.flow_lm, mode="reduce-overhead")
+            logger.info("flow_lm compiled with mode='reduce-overhead'")
+        except Exception as e:
+            logger.warning(f"torch.compile failed, staying eager: {e}")
+
     logger.info("TTS model loaded")
 
 